@@ -0,0 +1,32 @@
+"""Shared Gemini CLI invocation for the invoke-gemini scripts."""
+
+import subprocess
+import sys
+from typing import Optional
+
+
+def run_gemini(prompt: str, output_file: str, model: Optional[str] = None, all_files: bool = False) -> None:
+    """Run one Gemini prompt, streaming stdout/stderr into output_file. Exits on failure."""
+    command = ["gemini"]
+    if model:
+        command += ["--model", model]
+    command.append("-y")
+    if all_files:
+        command.append("-a")
+    command += ["-p", prompt]
+
+    try:
+        # Binary, unbuffered: the fd is only handed to the child process
+        with open(output_file, "wb", buffering=0) as f:
+            subprocess.run(
+                command,
+                stdout=f,
+                stderr=subprocess.STDOUT,
+                check=True,
+            )
+    except subprocess.CalledProcessError as e:
+        print(f"Error: Gemini invocation failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print("Error: gemini CLI not found in PATH", file=sys.stderr)
+        sys.exit(1)
@@ -2,19 +2,34 @@
 """Delegate large file analysis to Gemini CLI."""
 
 import argparse
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from _gemini import run_gemini
+
 
 LARGE_FILE_THRESHOLD = 1000
+COUNT_CHUNK_SIZE = 1 << 20
+# Size bounds that settle the line threshold without reading the file: exceeding it
+# takes more than LARGE_FILE_THRESHOLD newline bytes, and above ~1 KiB/line it is assumed
+SMALL_FILE_MAX_BYTES = LARGE_FILE_THRESHOLD
+LARGE_FILE_MIN_BYTES = LARGE_FILE_THRESHOLD * 1024
 DEFAULT_MODEL = "gemini-2.5-flash"
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_NOW = datetime.now
 
 
 def count_lines(file_path: Path) -> int:
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        return sum(1 for _ in f)
+    total = 0
+    last = b"\n"
+    with open(file_path, "rb") as f:
+        while chunk := f.read(COUNT_CHUNK_SIZE):
+            total += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    return total + (last != b"\n")
 
 
 def main():
@@ -27,14 +42,22 @@ def main():
         print(f"Error: File not found: {args.file_path}", file=sys.stderr)
         sys.exit(1)
 
-    line_count = count_lines(args.file_path)
-    if line_count <= LARGE_FILE_THRESHOLD:
-        print(f"Warning: File has {line_count} lines (<=1000). Gemini delegation not required.")
+    size = args.file_path.stat().st_size
+    if size <= SMALL_FILE_MAX_BYTES:
+        print(f"Warning: File has {size} bytes (<={SMALL_FILE_MAX_BYTES}). Gemini delegation not required.")
         sys.exit(0)
 
-    print(f"File has {line_count} lines. Delegating to Gemini...")
+    if size > LARGE_FILE_MIN_BYTES:
+        print(f"File has {size} bytes. Delegating to Gemini...")
+    else:
+        line_count = count_lines(args.file_path)
+        if line_count <= LARGE_FILE_THRESHOLD:
+            print(f"Warning: File has {line_count} lines (<=1000). Gemini delegation not required.")
+            sys.exit(0)
+
+        print(f"File has {line_count} lines. Delegating to Gemini...")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _NOW().strftime(TIMESTAMP_FORMAT)
     output_file = f"gemini_analysis_{timestamp}.txt"
 
     prompt = f"""Analyze file for Saturn Game Engine.
@@ -58,22 +81,10 @@ End with: TASK COMPLETED
 
 File: {args.file_path.resolve()}"""
 
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            result = subprocess.run(
-                ["gemini", "--model", args.model, "-y", "-a", "-p", prompt],
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                check=True,
-            )
-        print(f"Analysis complete: {output_file}")
-        print(f"OUTPUT_FILE={output_file}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Gemini invocation failed: {e}", file=sys.stderr)
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Error: gemini CLI not found in PATH", file=sys.stderr)
-        sys.exit(1)
+    run_gemini(prompt, output_file, model=args.model, all_files=True)
+
+    print(f"Analysis complete: {output_file}")
+    print(f"OUTPUT_FILE={output_file}")
 
 
 if __name__ == "__main__":
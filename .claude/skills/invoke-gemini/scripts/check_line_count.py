@@ -7,11 +7,18 @@ from pathlib import Path
 
 
 LARGE_FILE_THRESHOLD = 1000
+COUNT_CHUNK_SIZE = 1 << 20
 
 
 def count_lines(file_path: Path) -> int:
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        return sum(1 for _ in f)
+    total = 0
+    last = b"\n"
+    with open(file_path, "rb") as f:
+        while chunk := f.read(COUNT_CHUNK_SIZE):
+            total += chunk.count(b"\n")
+            last = chunk[-1:]
+    # A final line without a trailing newline still counts
+    return total + (last != b"\n")
 
 
 def main():
@@ -2,10 +2,15 @@
 """Delegate bulk code generation to Gemini CLI."""
 
 import argparse
-import subprocess
-import sys
 from datetime import datetime
 
+from _gemini import run_gemini
+
+
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_NOW = datetime.now
+
 
 def main():
     parser = argparse.ArgumentParser(description="Generate bulk code via Gemini CLI")
@@ -14,7 +19,7 @@ def main():
 
     print("Delegating bulk generation to Gemini...")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _NOW().strftime(TIMESTAMP_FORMAT)
     output_file = f"gemini_gen_{timestamp}.txt"
 
     prompt = f"""Generate code per specification.
@@ -30,22 +35,10 @@ Specification:
 
 End with: TASK COMPLETED"""
 
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            subprocess.run(
-                ["gemini", "-y", "-p", prompt],
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                check=True,
-            )
-        print(f"Generation complete: {output_file}")
-        print(f"OUTPUT_FILE={output_file}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Gemini invocation failed: {e}", file=sys.stderr)
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Error: gemini CLI not found in PATH", file=sys.stderr)
-        sys.exit(1)
+    run_gemini(prompt, output_file)
+
+    print(f"Generation complete: {output_file}")
+    print(f"OUTPUT_FILE={output_file}")
 
 
 if __name__ == "__main__":
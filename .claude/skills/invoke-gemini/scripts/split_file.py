@@ -2,11 +2,17 @@
 """Delegate structural file splitting to Gemini CLI."""
 
 import argparse
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
+from _gemini import run_gemini
+
+
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+_NOW = datetime.now
+
 
 def main():
     parser = argparse.ArgumentParser(description="Split file via Gemini CLI")
@@ -21,7 +27,7 @@ def main():
     print("Delegating file split to Gemini...")
     print(f"Intent: {args.intent}")
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _NOW().strftime(TIMESTAMP_FORMAT)
     output_file = f"gemini_split_{timestamp}.txt"
 
     prompt = f"""Split file into logical components WITHOUT changing behavior.
@@ -40,22 +46,10 @@ End with: TASK COMPLETED
 
 File: {args.file_path.resolve()}"""
 
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            subprocess.run(
-                ["gemini", "-y", "-p", prompt],
-                stdout=f,
-                stderr=subprocess.STDOUT,
-                check=True,
-            )
-        print(f"Split plan complete: {output_file}")
-        print(f"OUTPUT_FILE={output_file}")
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Gemini invocation failed: {e}", file=sys.stderr)
-        sys.exit(1)
-    except FileNotFoundError:
-        print("Error: gemini CLI not found in PATH", file=sys.stderr)
-        sys.exit(1)
+    run_gemini(prompt, output_file)
+
+    print(f"Split plan complete: {output_file}")
+    print(f"OUTPUT_FILE={output_file}")
 
 
 if __name__ == "__main__":
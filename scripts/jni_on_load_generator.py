@@ -6,10 +6,121 @@ Supports multiple classes with automatic class detection.
 
 import re
 import os
+import mmap
+import json
+import hashlib
 import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+# Bytes of @NativeExport-bearing source each worker process must get for the pool to pay off:
+# ~0.4s of serial parsing at ~10 MB/s, against ~0.15s to spawn a worker (Windows, macOS)
+_PARALLEL_BYTES_PER_WORKER = 4 << 20
+
+# Directories never holding project Kotlin sources, skipped while walking inputs
+_PRUNED_DIRS = {".git", "build", ".gradle", "node_modules", ".idea"}
+
+# Basic type mappings
+_JNI_TYPES = {
+    "Int": "I",
+    "Float": "F", 
+    "Double": "D",
+    "Long": "J",
+    "Boolean": "Z",
+    "Byte": "B",
+    "Short": "S",
+    "Char": "C",
+    "String": "Ljava/lang/String;",
+    "Unit": "V"
+}
+
+# Element type to array signature (e.g. "Int" -> "[I" for IntArray)
+_JNI_ARRAY_TYPES = {ktype: "[" + sig for ktype, sig in _JNI_TYPES.items()}
+
+# Wrapper objects used for nullable primitive types
+_JNI_WRAPPER_TYPES = {
+    "I": "Ljava/lang/Integer;",
+    "F": "Ljava/lang/Float;",
+    "D": "Ljava/lang/Double;", 
+    "J": "Ljava/lang/Long;",
+    "Z": "Ljava/lang/Boolean;",
+    "B": "Ljava/lang/Byte;",
+    "S": "Ljava/lang/Short;",
+    "C": "Ljava/lang/Character;"
+}
+
+# Single pattern matched against raw file bytes, extracting the package, class/object
+# declarations at the start of a line and @NativeExport functions in one traversal
+_KOTLIN_RE = re.compile(
+    rb'(?P<pkg>package\s+(?P<package>[a-zA-Z0-9_.]+))'
+    rb'|(?P<cls>^\s*(?:(?:public|private|internal|protected|abstract|final|open|sealed|data|inner)\s+)*(?:class|object)\s+(?P<class>\w+))'
+    # Enhanced regex to handle @JvmStatic and @NativeExport annotations
+    rb'|(?P<mth>(?:@JvmStatic\s*)?@NativeExport\s*fun\s+(?P<name>\w+)\s*\((?P<params>[^)]*)\)\s*(?::\s*(?P<ret>[^{\s]+))?)',
+    re.MULTILINE
+)
+
+# A single "name: Type" parameter and its separator; the type follows the last ':' to
+# handle cases like "param: List<String>"
+_PARAM_RE = re.compile(r'\s*(?:[^,:]*:)+\s*(?P<type>[^,:]*?)\s*(?:,|\Z)')
+
+# Fallback: simple class/object match, only tried when no declaration was found.
+# Matches with '@' directly before the keyword are rejected by is_annotated().
+_CLASS_FALLBACK_RE = re.compile(rb'\b(?:class|object)\s+(\w+)')
+
+# Templates for the generated JNI loader
+_PROLOGUE = """\
+// Auto-generated JNI loader code
+// Generated by jni_generator.py
+// Found {class_count} classes with {total_methods} methods
+
+JNIEXPORT jint JNI_OnLoad(JavaVM* vm, void* reserved)
+{{
+    saturn::tools::Logger::initialize();
+
+    auto helper = {helper_class}::getInstance();
+
+    helper->initialize(vm);
+
+"""
+
+_CLASS_BLOCK_HEADER = """\
+    // Load methods for {class_name}
+    {{
+        auto clazzRef = helper->findClass("{class_name}");
+        if (!clazzRef)
+        {{
+            SATURN_ERROR("Failed to find {short_name} class");
+            return JNI_ERR;
+        }}
+
+        helper->createGlobalRef(clazzRef);
+
+"""
+
+_METHOD_LINE = """\
+        helper->getStaticMethodID("{class_name}", "{name}",
+                                  "{sig}");
+
+"""
+
+_CLASS_BLOCK_FOOTER = """\
+    }
+
+"""
+
+_EPILOGUE = """\
+    return JNI_VERSION_1_6;
+}
+
+JNIEXPORT void JNICALL JNI_OnUnload(JavaVM* vm, void* /*reserved*/)
+{
+    saturn::platform::agdk::JNIHelper::getInstance()->shutdown();
+
+    saturn::tools::Logger::shutdown();
+}
+"""
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -44,6 +155,12 @@ def parse_arguments():
         help="Enable verbose output"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every Kotlin file instead of reusing the scan cache next to the output"
+    )
+    
     return parser.parse_args()
 
 def kotlin_to_jni_type(ktype: str, nullable: bool = False) -> str:
@@ -59,43 +176,13 @@ def kotlin_to_jni_type(ktype: str, nullable: bool = False) -> str:
     """
     # Handle array types
     if ktype.endswith("Array"):
-        element_type = ktype[:-5]  # Remove "Array" suffix
-        element_sig = kotlin_to_jni_type(element_type, False)
-        if element_sig:
-            return "[" + element_sig
-        return None
-    
-    # Basic type mappings
-    mapping = {
-        "Int": "I",
-        "Float": "F", 
-        "Double": "D",
-        "Long": "J",
-        "Boolean": "Z",
-        "Byte": "B",
-        "Short": "S",
-        "Char": "C",
-        "String": "Ljava/lang/String;",
-        "Unit": "V"
-    }
+        return _JNI_ARRAY_TYPES.get(ktype[:-5])  # Remove "Array" suffix
     
-    base_sig = mapping.get(ktype)
-    if not base_sig:
-        return None
+    base_sig = _JNI_TYPES.get(ktype)
     
     # For nullable primitive types, we need to use wrapper objects
-    if nullable and base_sig in "IFDJZBSC":
-        wrapper_mapping = {
-            "I": "Ljava/lang/Integer;",
-            "F": "Ljava/lang/Float;",
-            "D": "Ljava/lang/Double;", 
-            "J": "Ljava/lang/Long;",
-            "Z": "Ljava/lang/Boolean;",
-            "B": "Ljava/lang/Byte;",
-            "S": "Ljava/lang/Short;",
-            "C": "Ljava/lang/Character;"
-        }
-        return wrapper_mapping[base_sig]
+    if nullable and base_sig in _JNI_WRAPPER_TYPES:
+        return _JNI_WRAPPER_TYPES[base_sig]
     
     return base_sig
 
@@ -117,42 +204,74 @@ def parse_kotlin_type(type_str: str) -> Tuple[str, bool]:
     
     return type_str, is_nullable
 
-def extract_package_and_class(file_content: str, file_path: Path) -> Optional[str]:
+def is_annotation_name(candidate: bytes) -> bool:
     """
-    Extract the full class name (package + class) from Kotlin file content.
+    Check if a class/object name looks like an annotation rather than a class.
     
     Args:
-        file_content: Content of the Kotlin file
-        file_path: Path to the Kotlin file
+        candidate: Captured class/object name (e.g. b"NativeExport")
     
     Returns:
-        Full JNI class name (e.g. "com/example/MyClass") or None if not found
-    """
-    # Extract package declaration
-    package_match = re.search(r'package\s+([a-zA-Z0-9_.]+)', file_content)
-    package_name = package_match.group(1) if package_match else None
-    
-    # Extract class/object name - improved regex to avoid matching annotations
-    class_patterns = [
-        # Match class/object declarations, avoiding annotations
-        r'(?:^|\n)\s*(?:(?:public|private|internal|protected)\s+)?(?:class|object)\s+(\w+)',
-        # Match class/object with modifiers but not preceded by @
-        r'(?:^|\n)\s*(?:(?:abstract|final|open|sealed|data|inner)\s+)*(?:class|object)\s+(\w+)',
-        # Fallback: simple class/object match not preceded by @
-        r'(?<!@\w{0,20})\b(?:class|object)\s+(\w+)'
-    ]
+        True if the name should not be used as the class name
+    """
+    return candidate.startswith(b"Native")
+
+def is_annotated(file_content: bytes, pos: int) -> bool:
+    """
+    Check if a class/object keyword is part of an annotation (e.g. "@class").
+    
+    Annotations applied to a declaration on the same line (e.g. "@Keep object Foo")
+    are not rejected, only '@' directly before the keyword.
     
+    Args:
+        file_content: Raw bytes (or mmap) of the Kotlin file
+        pos: Offset of the class/object keyword
+    
+    Returns:
+        True if the keyword is directly preceded by '@'
+    """
+    return pos > 0 and file_content[pos - 1:pos] == b"@"
+
+def parse_kotlin_source(file_content: bytes, file_path: Path) -> Tuple[Optional[str], List[Tuple[str, str, str]]]:
+    """
+    Extract the full class name and raw @NativeExport functions from Kotlin file content.
+    
+    Args:
+        file_content: Raw bytes (or mmap) of the Kotlin file
+        file_path: Path to the Kotlin file
+    
+    Returns:
+        Tuple of (full JNI class name or None, [(function_name, params, return_type)])
+    """
+    package_name = None
     class_name = None
-    for pattern in class_patterns:
-        class_matches = re.finditer(pattern, file_content, re.MULTILINE)
-        for match in class_matches:
-            candidate = match.group(1)
-            # Skip if this looks like an annotation (starts with capital but is likely annotation name)
-            if candidate != "NativeExport" and not candidate.startswith("Native"):
-                class_name = candidate
+    methods = []
+    
+    # Only the captured groups are decoded, never the whole file. Identifiers matched by
+    # the bytes \w and [a-zA-Z0-9_.] classes are ASCII by construction; free-form
+    # parameter and return text may hold anything, so invalid UTF-8 is replaced and
+    # then reported as an unknown type rather than failing the file.
+    for match in _KOTLIN_RE.finditer(file_content):
+        kind = match.lastgroup
+        if kind == "mth":
+            ret = match.group("ret")
+            methods.append((
+                match.group("name").decode('ascii'),
+                match.group("params").strip().decode('utf-8', errors='replace'),
+                ret.decode('utf-8', errors='replace') if ret else "Unit"
+            ))
+        elif kind == "cls":
+            candidate = match.group("class")
+            if class_name is None and not is_annotation_name(candidate):
+                class_name = candidate.decode('ascii')
+        elif package_name is None:
+            package_name = match.group("package").decode('ascii')
+    
+    if not class_name:
+        for match in _CLASS_FALLBACK_RE.finditer(file_content):
+            if not is_annotation_name(match.group(1)) and not is_annotated(file_content, match.start()):
+                class_name = match.group(1).decode('ascii')
                 break
-        if class_name:
-            break
     
     # If no explicit class found, try to infer from filename
     if not class_name:
@@ -163,12 +282,37 @@ def extract_package_and_class(file_content: str, file_path: Path) -> Optional[st
     
     # Construct full class name
     if package_name and class_name:
-        return package_name.replace('.', '/') + '/' + class_name
+        return package_name.replace('.', '/') + '/' + class_name, methods
     elif class_name:
         # No package, just class name
-        return class_name
+        return class_name, methods
+    
+    return None, methods
+
+def walk_kotlin_files(root: Path):
+    """
+    Recursively yield .kt files under a directory, pruning build and tooling directories.
+    
+    Args:
+        root: Directory to walk
     
-    return None
+    Yields:
+        Path objects for .kt files
+    """
+    pending = [root]
+    
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _PRUNED_DIRS:
+                            pending.append(entry.path)
+                    elif entry.name.endswith(".kt") and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as rglob() did
+            continue
 
 def find_kotlin_files(input_paths: List[str]) -> List[Path]:
     """
@@ -180,169 +324,390 @@ def find_kotlin_files(input_paths: List[str]) -> List[Path]:
     Returns:
         List of Path objects for .kt files
     """
-    kotlin_files = []
+    # Dict keys dedup overlapping inputs while keeping discovery order
+    kotlin_files = {}
     
     for input_path in input_paths:
         path = Path(input_path)
         
         if path.is_file() and path.suffix == ".kt":
-            kotlin_files.append(path)
+            kotlin_files[path] = None
         elif path.is_dir():
-            kotlin_files.extend(path.rglob("*.kt"))
+            kotlin_files.update(dict.fromkeys(walk_kotlin_files(path)))
         else:
             # Try as glob pattern
-            kotlin_files.extend(Path(".").glob(input_path))
+            kotlin_files.update(dict.fromkeys(Path(".").glob(input_path)))
     
-    return list(set(kotlin_files))  # Remove duplicates
+    return list(kotlin_files)
 
-def extract_native_exports(kotlin_files: List[Path], verbose: bool = False) -> Dict[str, List[Tuple[str, str]]]:
+def scan_kotlin_file(kt_file: Path, verbose: bool = False) -> Tuple[Optional[str], List[Tuple[str, str]], List[str], List[str], bool]:
     """
-    Extract @NativeExport functions from Kotlin files, grouped by class.
+    Extract @NativeExport functions from a single Kotlin file.
+    
+    Messages are collected instead of printed so that files scanned in
+    worker processes still report in a deterministic order.
     
     Args:
-        kotlin_files: List of Kotlin files to scan
+        kt_file: Kotlin file to scan
         verbose: Enable verbose output
     
     Returns:
-        Dictionary mapping class names to lists of (function_name, jni_signature) tuples
+        Tuple of (class_name, [(function_name, jni_signature)], messages, warnings, readable),
+        class_name being None if the file was skipped. Warnings and errors appear
+        in both lists; verbose-only messages appear in messages alone. readable is
+        False when the file could not be read, so the result must not be cached.
     """
-    # Enhanced regex to handle @JvmStatic and @NativeExport annotations
-    method_pattern = re.compile(
-        r"(?:@JvmStatic\s*)?@NativeExport\s*fun\s+(?P<name>\w+)\s*\((?P<params>[^)]*)\)\s*(?::\s*(?P<ret>[^{\s]+))?",
-        re.MULTILINE
-    )
+    log = []
+    warnings = []
+    
+    def report(message: str):
+        log.append(message)
+        warnings.append(message)
+    
+    if verbose:
+        log.append(f"Scanning: {kt_file}")
+    
+    # Map the file read-only so the regexes scan the page cache directly
+    try:
+        with open(kt_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None, [], log, warnings, True
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except Exception as e:
+        report(f"Warning: Could not read {kt_file}: {e}")
+        return None, [], log, warnings, False
+    
+    try:
+        # Cheap substring search first: most files have no exports and skip the regex pass.
+        # mmap's "in" operator only tests single bytes, hence find().
+        if mm.find(b"@NativeExport") == -1:
+            return None, [], log, warnings, True
+        
+        # Extract class information and functions in a single pass
+        class_name, matches = parse_kotlin_source(mm, kt_file)
+    except UnicodeDecodeError as e:
+        # Captured text is decoded lazily, so invalid UTF-8 only surfaces here
+        report(f"Warning: Could not read {kt_file}: {e}")
+        return None, [], log, warnings, False
+    finally:
+        mm.close()
+    
+    if not class_name:
+        report(f"Warning: Could not determine class name for {kt_file}")
+        return None, [], log, warnings, True
     
-    class_methods = defaultdict(list)
+    if verbose:
+        log.append(f"  Class: {class_name}")
     
-    for kt_file in kotlin_files:
+    # Find all @NativeExport methods in this file
+    methods_found = []
+    for name, params, ret in matches:
         if verbose:
-            print(f"Scanning: {kt_file}")
+            log.append(f"  Found function: {name}")
+        
+        # Parse parameter types
+        sig_parts = []
+        param_parsing_success = True
+        
+        if params:
+            # Consume the parameter list one "name: Type" entry at a time
+            pos = 0
+            while pos < len(params):
+                param_match = _PARAM_RE.match(params, pos)
+                if not param_match:
+                    param = params[pos:].split(',', 1)[0].strip()
+                    report(f"Warning: Invalid parameter format in {name}: {param}")
+                    param_parsing_success = False
+                    break
+                
+                pos = param_match.end()
+                param_type = param_match.group("type")
+                
+                type_name, is_nullable = parse_kotlin_type(param_type)
+                sig = kotlin_to_jni_type(type_name, is_nullable)
+                
+                if not sig:
+                    report(f"Error: Unknown parameter type in {name}: {param_type}")
+                    param_parsing_success = False
+                    break
+                
+                sig_parts.append(sig)
         
+        # Only proceed if parameter parsing was successful (or no parameters)
+        if param_parsing_success:
+            # Parse return type
+            ret_type, ret_nullable = parse_kotlin_type(ret)
+            ret_sig = kotlin_to_jni_type(ret_type, ret_nullable)
+            
+            if not ret_sig:
+                report(f"Error: Unknown return type in {name}: {ret}")
+                continue
+            
+            signature = "(" + "".join(sig_parts) + ")" + ret_sig
+            methods_found.append((name, signature))
+            
+            if verbose:
+                log.append(f"    Signature: {signature}")
+    
+    return class_name, methods_found, log, warnings, True
+
+def contains_native_exports(kt_file: Path) -> bool:
+    """
+    Check if a Kotlin file mentions @NativeExport at all.
+    
+    Args:
+        kt_file: Kotlin file to check
+    
+    Returns:
+        True if the annotation is present or the file could not be checked
+    """
+    try:
+        with open(kt_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(b"@NativeExport") != -1
+    except OSError:
+        # Let the scan report the failure
+        return True
+
+def parallel_worker_count(kotlin_files: List[Path]) -> int:
+    """
+    Decide how many worker processes are worth spawning to scan files.
+    
+    Files without @NativeExport cost a few microseconds each, so only the
+    source that actually gets parsed counts towards the worker budget. The
+    files are only pre-checked once their total size could reach it.
+    
+    Args:
+        kotlin_files: Kotlin files about to be scanned
+    
+    Returns:
+        Number of workers, 1 meaning the files should be scanned serially
+    """
+    cpu_count = os.cpu_count() or 1
+    if cpu_count < 2:
+        return 1
+    
+    sizes = []
+    for kt_file in kotlin_files:
         try:
-            text = kt_file.read_text(encoding='utf-8')
-        except Exception as e:
-            print(f"Warning: Could not read {kt_file}: {e}")
+            sizes.append(kt_file.stat().st_size)
+        except OSError:
+            sizes.append(0)
+    
+    if sum(sizes) < 2 * _PARALLEL_BYTES_PER_WORKER:
+        return 1
+    
+    parsed_bytes = sum(size for kt_file, size in zip(kotlin_files, sizes) if contains_native_exports(kt_file))
+    return min(cpu_count, parsed_bytes // _PARALLEL_BYTES_PER_WORKER) or 1
+
+def generator_fingerprint() -> str:
+    """
+    Hash of this script, so scan caches written by another version are discarded.
+    
+    Returns:
+        Hex digest of the generator source
+    """
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+def is_valid_cache_entry(entry) -> bool:
+    """
+    Check the shape of a scan cache entry.
+    
+    Args:
+        entry: Value loaded from the cache file
+    
+    Returns:
+        True if entry is [mtime_ns, size, class_name, methods, warnings]
+    """
+    if not isinstance(entry, list) or len(entry) != 5:
+        return False
+    
+    mtime_ns, size, class_name, methods, warnings = entry
+    return (
+        isinstance(mtime_ns, int)
+        and isinstance(size, int)
+        and (class_name is None or isinstance(class_name, str))
+        and isinstance(methods, list)
+        and all(
+            isinstance(method, list) and len(method) == 2 and all(isinstance(part, str) for part in method)
+            for method in methods
+        )
+        and isinstance(warnings, list)
+        and all(isinstance(message, str) for message in warnings)
+    )
+
+def load_scan_cache(cache_path: Path) -> Dict[str, list]:
+    """
+    Load the per-file scan cache written by a previous run.
+    
+    Args:
+        cache_path: Cache file path
+    
+    Returns:
+        Dictionary mapping absolute file paths to [mtime_ns, size, class_name, methods, warnings],
+        empty if the cache is missing, unreadable or written by another generator version.
+        Malformed entries are dropped, so their files are rescanned.
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict) or data.get("fingerprint") != generator_fingerprint():
+        return {}
+    
+    files = data.get("files")
+    if not isinstance(files, dict):
+        return {}
+    
+    return {path: entry for path, entry in files.items() if is_valid_cache_entry(entry)}
+
+def save_scan_cache(cache: Dict[str, list], cache_path: Path):
+    """
+    Atomically write the per-file scan cache.
+    
+    Args:
+        cache: Dictionary as returned by load_scan_cache
+        cache_path: Cache file path
+    """
+    data = {"fingerprint": generator_fingerprint(), "files": cache}
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data), encoding='utf-8')
+    os.replace(tmp_path, cache_path)
+
+def extract_native_exports(kotlin_files: List[Path], verbose: bool = False, cache: Optional[Dict[str, list]] = None) -> Dict[str, Dict[Tuple[str, str], None]]:
+    """
+    Extract @NativeExport functions from Kotlin files, grouped by class.
+    
+    Files are scanned in a process pool only when there is enough
+    @NativeExport-bearing source to amortise the worker startup cost. When a cache is given, files whose
+    mtime and size are unchanged reuse their cached result and warnings,
+    and the cache is updated in place to describe exactly the given files.
+    
+    Args:
+        kotlin_files: List of Kotlin files to scan
+        verbose: Enable verbose output
+        cache: Optional scan cache as returned by load_scan_cache
+    
+    Returns:
+        Dictionary mapping class names to ordered, deduplicated
+        (function_name, jni_signature) tuples stored as dict keys
+    """
+    class_methods = {}
+    # Per class, the signature each function name was first exported with
+    first_signatures = {}
+    results = [None] * len(kotlin_files)
+    stale = []
+    keys = []
+    
+    for index, kt_file in enumerate(kotlin_files):
+        if cache is None:
+            stale.append(index)
             continue
         
-        # Extract class information
-        class_name = extract_package_and_class(text, kt_file)
-        if not class_name:
-            print(f"Warning: Could not determine class name for {kt_file}")
+        try:
+            stat = kt_file.stat()
+        except OSError:
+            stale.append(index)
+            keys.append(None)
             continue
         
-        if verbose:
-            print(f"  Class: {class_name}")
+        key = str(kt_file.resolve())
+        keys.append((key, stat.st_mtime_ns, stat.st_size))
         
-        # Find all @NativeExport methods in this file
-        methods_found = []
-        for match in method_pattern.finditer(text):
-            name = match.group("name")
-            params = match.group("params").strip()
-            ret = match.group("ret") or "Unit"
-            
-            if verbose:
-                print(f"  Found function: {name}")
-            
-            # Parse parameter types
-            sig_parts = []
-            param_parsing_success = True
-            
-            if params:
-                for param in params.split(','):
-                    param = param.strip()
-                    if ':' not in param:
-                        print(f"Warning: Invalid parameter format in {name}: {param}")
-                        param_parsing_success = False
-                        break
-                    
-                    # Split on last ':' to handle cases like "param: List<String>"
-                    colon_idx = param.rfind(':')
-                    param_type = param[colon_idx + 1:].strip()
-                    
-                    type_name, is_nullable = parse_kotlin_type(param_type)
-                    sig = kotlin_to_jni_type(type_name, is_nullable)
-                    
-                    if not sig:
-                        print(f"Error: Unknown parameter type in {name}: {param_type}")
-                        param_parsing_success = False
-                        break
-                    
-                    sig_parts.append(sig)
+        entry = cache.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            # Replay the file's warnings and errors so they are reported on every build
+            log = ([f"Cached: {kt_file}"] if verbose else []) + entry[4]
+            results[index] = (entry[2], [tuple(method) for method in entry[3]], log, entry[4], True)
+        else:
+            stale.append(index)
+    
+    stale_files = [kotlin_files[index] for index in stale]
+    workers = parallel_worker_count(stale_files)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            scanned = list(executor.map(scan_kotlin_file, stale_files, repeat(verbose), chunksize=16))
+    else:
+        scanned = [scan_kotlin_file(kt_file, verbose) for kt_file in stale_files]
+    
+    for index, result in zip(stale, scanned):
+        results[index] = result
+    
+    if cache is not None:
+        fresh = {}
+        for index, key in enumerate(keys):
+            if key is None:
+                continue
             
-            # Only proceed if parameter parsing was successful (or no parameters)
-            if param_parsing_success:
-                # Parse return type
-                ret_type, ret_nullable = parse_kotlin_type(ret)
-                ret_sig = kotlin_to_jni_type(ret_type, ret_nullable)
-                
-                if not ret_sig:
-                    print(f"Error: Unknown return type in {name}: {ret}")
-                    continue
-                
-                signature = "(" + "".join(sig_parts) + ")" + ret_sig
-                methods_found.append((name, signature))
-                
-                if verbose:
-                    print(f"    Signature: {signature}")
+            path, mtime_ns, size = key
+            class_name, methods_found, _, warnings, readable = results[index]
+            # Read failures (permissions, EMFILE, bad encoding) may clear without the
+            # file's mtime changing, so they are retried on the next run
+            if readable:
+                fresh[path] = [mtime_ns, size, class_name, methods_found, warnings]
+        
+        cache.clear()
+        cache.update(fresh)
+    
+    for class_name, methods_found, log, _, _ in results:
+        for message in log:
+            print(message)
         
-        # Add methods to the class
-        if methods_found:
-            class_methods[class_name].extend(methods_found)
+        if not methods_found:
+            continue
+        
+        # Dict keys drop functions exported from several files (e.g. expect/actual) in O(1)
+        # while keeping discovery order and genuine overloads
+        bucket = class_methods.get(class_name)
+        if bucket is None:
+            bucket = class_methods[class_name] = {}
+            names = first_signatures[class_name] = {}
+        else:
+            names = first_signatures[class_name]
+            for name, signature in methods_found:
+                if name in names and (name, signature) not in bucket:
+                    print(f"Warning: {class_name}.{name} is exported with different signatures "
+                          f"across files: {names[name]} and {signature}")
+        
+        for method in methods_found:
+            bucket[method] = None
+            names.setdefault(method[0], method[1])
     
-    return dict(class_methods)
+    return class_methods
 
-def generate_cpp_file(class_methods: Dict[str, List[Tuple[str, str]]], output_path: Path, helper_class: str):
+def generate_cpp_file(class_methods: Dict[str, Dict[Tuple[str, str], None]], output_path: Path, helper_class: str):
     """
     Generate the C++ JNI loader file.
     
     Args:
-        class_methods: Dictionary mapping class names to method lists
+        class_methods: Dictionary mapping class names to (function_name, jni_signature) keys
         output_path: Output file path
         helper_class: JNI helper class name
     """
     total_methods = sum(len(methods) for methods in class_methods.values())
     
-    with output_path.open('w', encoding='utf-8') as f:
-        f.write("// Auto-generated JNI loader code\n")
-        f.write("// Generated by jni_generator.py\n")
-        f.write(f"// Found {len(class_methods)} classes with {total_methods} methods\n\n")
-        
-        f.write("JNIEXPORT jint JNI_OnLoad(JavaVM* vm, void* reserved)\n")
-        f.write("{\n")
-        f.write("    saturn::tools::Logger::initialize();\n\n")
-        
-        f.write(f"    auto helper = {helper_class}::getInstance();\n\n")
-        
-        f.write("    helper->initialize(vm);\n\n")
-        
-        # Process each class
-        for class_name, methods in class_methods.items():
-            f.write(f"    // Load methods for {class_name}\n")
-            f.write(f"    {{\n")
-            f.write(f"        auto clazzRef = helper->findClass(\"{class_name}\");\n")
-            f.write(f"        if (!clazzRef)\n")
-            f.write(f"        {{\n")
-            f.write(f"            SATURN_ERROR(\"Failed to find {class_name.split('/')[-1]} class\");\n")
-            f.write(f"            return JNI_ERR;\n")
-            f.write(f"        }}\n\n")
-            
-            f.write(f"        helper->createGlobalRef(clazzRef);\n\n")
-            
-            # Generate getStaticMethodID calls for each method in this class
-            for name, sig in methods:
-                f.write(f"        helper->getStaticMethodID(\"{class_name}\", \"{name}\",\n")
-                f.write(f"                                  \"{sig}\");\n\n")
-            
-            f.write(f"    }}\n\n")
+    parts = [_PROLOGUE.format(
+        class_count=len(class_methods),
+        total_methods=total_methods,
+        helper_class=helper_class
+    )]
+    
+    # Process each class
+    for class_name, methods in class_methods.items():
+        parts.append(_CLASS_BLOCK_HEADER.format(class_name=class_name, short_name=class_name.rsplit('/', 1)[-1]))
         
-        f.write("    return JNI_VERSION_1_6;\n")
-        f.write("}\n")
+        # Generate getStaticMethodID calls for each method in this class
+        parts.extend(_METHOD_LINE.format(class_name=class_name, name=name, sig=sig) for name, sig in methods)
         
-        f.write("\nJNIEXPORT void JNICALL JNI_OnUnload(JavaVM* vm, void* /*reserved*/)\n")
-        f.write("{\n")
-        f.write("    saturn::platform::agdk::JNIHelper::getInstance()->shutdown();\n\n")
-        f.write("    saturn::tools::Logger::shutdown();\n")
-        f.write("}\n")
+        parts.append(_CLASS_BLOCK_FOOTER)
+    
+    parts.append(_EPILOGUE)
+    
+    # Write the whole file with a single call
+    output_path.write_text(''.join(parts), encoding='utf-8')
 
 def main():
     """Main entry point."""
@@ -362,15 +727,26 @@ def main():
     if args.verbose:
         print(f"Found {len(kotlin_files)} Kotlin files")
     
+    output_path = Path(args.output)
+    
+    # Reuse results for unchanged files from the cache next to the output file
+    cache_path = output_path.with_name(output_path.stem + ".cache.json")
+    cache = None if args.no_cache else load_scan_cache(cache_path)
+    
     # Extract native exports grouped by class
-    class_methods = extract_native_exports(kotlin_files, args.verbose)
+    class_methods = extract_native_exports(kotlin_files, args.verbose, cache)
+    
+    if cache is not None:
+        try:
+            save_scan_cache(cache, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write scan cache {cache_path}: {e}")
     
     if not class_methods:
         print("Warning: No @NativeExport methods found")
         return 0
     
     # Generate output file
-    output_path = Path(args.output)
     generate_cpp_file(class_methods, output_path, args.helper_class)
     
     total_methods = sum(len(methods) for methods in class_methods.values())
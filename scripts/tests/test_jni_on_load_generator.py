@@ -0,0 +1,25 @@
+"""Regression tests for jni_on_load_generator.py."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from jni_on_load_generator import parse_kotlin_source
+
+
+class ClassDetectionTest(unittest.TestCase):
+    def test_annotated_object_on_same_line(self):
+        source = b"package com.x.y\n\n@Keep object Beta {\n    @NativeExport fun f() {}\n}\n"
+        class_name, _ = parse_kotlin_source(source, Path("B.kt"))
+        self.assertEqual(class_name, "com/x/y/Beta")
+
+    def test_annotation_keyword_is_rejected(self):
+        source = b"package com.x.y\n\nval k = @class Foo\n"
+        class_name, _ = parse_kotlin_source(source, Path("b.kt"))
+        self.assertEqual(class_name, "com/x/y/B")
+
+
+if __name__ == "__main__":
+    unittest.main()